@@ -73,8 +73,10 @@ def run():
 
     st.title("📊 Data Exploration")
 
-    # Load model and data
-    model, le, features, df, (X_test, y_test) = get_model()
+    # Load model and data (zero-copy views over the cached compact dataset)
+    model, le, features, data, _, _ = get_model()
+    df = data.frame()
+    X_test, y_test = data.test()
 
     # Drop unwanted columns (safety)
     if "Unnamed: 0" in df.columns:
@@ -89,12 +91,11 @@ def run():
 
     # Class Distribution
     st.subheader("Class Distribution")
-    df_copy = df.copy()
-    df_copy["class"] = le.inverse_transform(df_copy["koi_disposition"])
-    fig = px.histogram(df_copy, x="class", color="class",
-                       title="Class Distribution: Confirmed vs False Positive",
-                       labels={"class": "Class"},
-                       color_discrete_sequence=px.colors.qualitative.Vivid)
+    class_counts = data.class_counts()
+    fig = px.bar(x=class_counts.index, y=class_counts.values, color=class_counts.index,
+                 title="Class Distribution: Confirmed vs False Positive",
+                 labels={"x": "Class", "y": "count", "color": "class"},
+                 color_discrete_sequence=px.colors.qualitative.Vivid)
     st.plotly_chart(fig, use_container_width=True)
 
     # Feature Importance
@@ -122,13 +123,14 @@ def run():
     # Scatter Matrix
     st.subheader("Scatter Matrix")
     if len(selected_features) > 1:
-        scatter_df = df.copy()
-        scatter_df["class"] = le.inverse_transform(scatter_df["koi_disposition"]).astype(str)
-        n_samples = min(sample_size, len(scatter_df))
+        n_samples = min(sample_size, len(df))
         if n_samples < 2:
             st.warning("Not enough data for scatter matrix plot.")
         else:
-            fig = px.scatter_matrix(scatter_df.sample(n=n_samples),
+            # Sample first so only the plotted rows get a class column
+            scatter_df = df.sample(n=n_samples)
+            scatter_df["class"] = le.inverse_transform(scatter_df["koi_disposition"]).astype(str)
+            fig = px.scatter_matrix(scatter_df,
                                    dimensions=selected_features,
                                    color="class",
                                    title="Scatter Matrix of Selected Features")
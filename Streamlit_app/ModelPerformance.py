@@ -1,5 +1,5 @@
 import streamlit as st
-from cache_utils import get_model
+from cache_utils import get_model, get_leaderboard
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 import plotly.figure_factory as ff
 import pandas as pd
@@ -74,7 +74,8 @@ def run():
     st.title("📈 Model Performance")
 
     # Load model and data
-    model, le, features, df, (X_test, y_test) = get_model()
+    model, le, features, data, _, _ = get_model()
+    X_test, y_test = data.test()
     y_pred = model.predict(X_test)
 
     # Accuracy
@@ -109,3 +110,19 @@ def run():
         y_test, y_pred, target_names=labels, output_dict=True
     )
     st.dataframe(pd.DataFrame(report).transpose())
+
+    # Model Leaderboard
+    st.subheader("Model Leaderboard")
+    st.caption("5-fold cross-validation of candidate models and resampling strategies on the training split.")
+    if st.button("Run Leaderboard") or st.session_state.get("show_leaderboard"):
+        st.session_state["show_leaderboard"] = True
+        board = get_leaderboard()
+        st.dataframe(
+            board[[
+                "model", "resampling",
+                "balanced_accuracy_mean", "balanced_accuracy_std",
+                "accuracy_mean", "f1_mean", "roc_auc_mean",
+                "fit_time_mean", "predict_time_mean",
+            ]].style.format(precision=3),
+            use_container_width=True
+        )
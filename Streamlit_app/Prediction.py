@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-from cache_utils import get_model
+import numpy as np
+from cache_utils import get_model, get_drift_monitor, get_inference_pool
 import random
 
 def run():
@@ -70,13 +71,15 @@ def run():
     st.title("🚀 Exoplanet Prediction")
 
     # --- Load model and metadata ---
-    model, le, features, df, (X_test, y_test) = get_model()
+    model, le, features, data, drift_monitor, neighbor_index = get_model()
+    live_drift = get_drift_monitor()
 
     # --- Selection: Manual or CSV Upload ---
     st.subheader("Choose Input Method")
     input_method = st.radio("Select how to provide data:", ["Manual Entry", "Upload CSV"])
 
     input_df = None
+    uploaded_file = None
     if input_method == "Manual Entry":
         st.subheader("Enter Exoplanet Candidate Data")
         user_input = {feat: st.number_input(f"{feat}", value=0.0) for feat in features}
@@ -92,40 +95,137 @@ def run():
             st.dataframe(input_df.head())
             input_df = input_df[features]
 
+    n_neighbors = st.slider("Similar known KOIs to show:", 1, 20, 5)
+
     # --- Prediction Button ---
     if st.button("Predict"):
         if input_df is None:
             st.warning("Please enter data or upload a valid CSV file.")
         else:
-            preds = model.predict(input_df)
-            labels = le.inverse_transform(preds)
-            probas = model.predict_proba(input_df)
+            # Sketch this batch and fold it into the shared live drift monitor
+            batch_drift = drift_monitor.new_window()
+            batch_drift.update(input_df)
+            live_drift.merge(batch_drift)
 
             if input_method == "Manual Entry":
+                preds = model.predict(input_df)
+                labels = le.inverse_transform(preds)
+                probas = model.predict_proba(input_df)
+
                 # Detailed report only for manual input
                 st.subheader("📊 Prediction Report")
                 st.success(f"### Prediction: {labels[0]}")
                 st.write(f"Confidence: {probas.max():.2%}")
 
-            else:
-                # Show dataframe with predictions for CSV uploads
-                st.subheader("✅ Predictions Completed")
-                st.write(f"Predictions generated for {len(input_df)} candidates.")
-
-                # Add prediction + confidence columns
-                results_df = input_df.copy()
-                results_df["Prediction"] = labels
-                results_df["Confidence"] = probas.max(axis=1)
-
-                # Show dataframe in app
-                st.write("### Results with Predictions")
-                st.dataframe(results_df)
-
-                # Download option
-                csv = results_df.to_csv(index=False).encode("utf-8")
-                st.download_button(
-                    label="📥 Download Predictions as CSV",
-                    data=csv,
-                    file_name="exoplanet_predictions.csv",
-                    mime="text/csv",
+                # Most similar already-dispositioned KOIs
+                st.subheader("🔭 Most Similar Known KOIs")
+                neighbors = neighbor_index.neighbors(input_df, k=n_neighbors, classes=le.classes_)
+                neighbor_rows = data.frame().loc[neighbors["koi_row"], features].reset_index(drop=True)
+                st.dataframe(
+                    pd.concat([neighbors.drop(columns="query"), neighbor_rows], axis=1).set_index("rank"),
+                    use_container_width=True
                 )
+
+            else:
+                # Score uploads in the shared worker pool, off this script thread
+                previous = st.session_state.pop("upload_job", None)
+                if previous is not None:
+                    previous["job"].cancel()
+                st.session_state["upload_job"] = {
+                    "job": get_inference_pool().submit(input_df.to_numpy(dtype=np.float64)),
+                    "input_df": input_df,
+                    "batch_drift": batch_drift,
+                    "file_id": uploaded_file.file_id,
+                }
+
+    # --- Upload Scoring Job (kept across reruns until the file changes) ---
+    upload_job = st.session_state.get("upload_job")
+    if upload_job is not None and input_method == "Upload CSV":
+        if uploaded_file is None or upload_job["file_id"] != uploaded_file.file_id:
+            upload_job["job"].cancel()
+            del st.session_state["upload_job"]
+            upload_job = None
+
+    if upload_job is not None and input_method == "Upload CSV":
+        job, input_df, batch_drift = upload_job["job"], upload_job["input_df"], upload_job["batch_drift"]
+
+        if not job.done():
+            # Poll the job and show rows as their chunks come back
+            st.subheader("⏳ Scoring Candidates")
+            progress = st.progress(0.0)
+            partial_view = st.empty()
+            while not job.done():
+                done_rows, probas = job.partial()
+                progress.progress(job.progress, text=f"{job.rows_done} / {job.n_rows} candidates scored")
+                partial_view.dataframe(input_df[done_rows].head(1000).assign(
+                    Prediction=le.inverse_transform(probas[:1000].argmax(axis=1)),
+                    Confidence=probas[:1000].max(axis=1),
+                ))
+                job.wait(0.5)
+            progress.empty()
+            partial_view.empty()
+
+        if job.error is not None:
+            st.error(f"❌ Scoring failed: {job.error}")
+
+        else:
+            if "predictions" not in upload_job:
+                probas = job.result()
+                upload_job["predictions"] = {
+                    "Prediction": le.inverse_transform(probas.argmax(axis=1)),
+                    "Confidence": probas.max(axis=1),
+                }
+
+            # Nearest known KOIs per candidate (catalog row ids + dispositions),
+            # kept per k so moving the slider back and forth does not re-query
+            neighbor_columns = upload_job.setdefault("neighbors", {})
+            if n_neighbors not in neighbor_columns:
+                neighbors = neighbor_index.neighbors(input_df, k=n_neighbors, classes=le.classes_)
+                grouped = neighbors.groupby("query")
+                neighbor_columns[n_neighbors] = {
+                    "Nearest KOI Rows": grouped["koi_row"].agg(lambda r: ";".join(map(str, r))).to_numpy(),
+                    "Nearest Dispositions": grouped["disposition"].agg(";".join).to_numpy(),
+                }
+
+            # Add prediction, confidence and neighbour columns to a new frame;
+            # the uploaded input_df held in session state stays untouched
+            results_df = input_df.assign(**upload_job["predictions"], **neighbor_columns[n_neighbors])
+
+            # Show dataframe with predictions for CSV uploads
+            st.subheader("✅ Predictions Completed")
+            st.write(f"Predictions generated for {len(results_df)} candidates in {job.latency:.1f}s.")
+
+            # Show dataframe in app
+            st.write("### Results with Predictions")
+            st.dataframe(results_df)
+
+            # Download option
+            csv = results_df.to_csv(index=False).encode("utf-8")
+            st.download_button(
+                label="📥 Download Predictions as CSV",
+                data=csv,
+                file_name="exoplanet_predictions.csv",
+                mime="text/csv",
+            )
+
+            # Drift of this upload vs. the training distribution
+            st.subheader("🛰️ Input Drift")
+            drift_df = batch_drift.report()
+            n_shifted = (drift_df["status"] == "major").sum()
+            if n_shifted:
+                st.warning(f"{n_shifted} feature(s) differ strongly from the training data (PSI > 0.25).")
+            elif (drift_df["status"] == "insufficient data").any():
+                st.info("Too few candidates in this upload for a reliable drift estimate.")
+            st.dataframe(drift_df.style.format(precision=3), use_container_width=True)
+            st.download_button(
+                label="📥 Download Drift Report as CSV",
+                data=drift_df.to_csv(index=False).encode("utf-8"),
+                file_name="exoplanet_drift_report.csv",
+                mime="text/csv",
+            )
+
+            with st.expander(f"All scored candidates so far ({live_drift.n_live})"):
+                st.dataframe(live_drift.report().style.format(precision=3), use_container_width=True)
+
+        with st.expander("⚙️ Inference Pool Metrics"):
+            st.dataframe(pd.DataFrame([get_inference_pool().metrics()]), use_container_width=True)
@@ -1,8 +1,31 @@
 # cache_utils.py
 import streamlit as st
 from model_utils import train_model
+from leaderboard_utils import run_leaderboard
+from inference_utils import InferencePool
 
 @st.cache_resource
 def get_model():
-    """Load and cache the model, label encoder, features, dataframe, and test data."""
+    """Load and cache the model, label encoder, features, compact dataset, drift monitor and neighbour index."""
     return train_model("exoplanets data_Set.csv", "exoplanets data_set 2.csv")
+
+
+@st.cache_data(show_spinner="Cross-validating candidate models...")
+def get_leaderboard():
+    """Cross-validated model zoo on the training split (fold results cached on disk)."""
+    _, _, _, data, _, _ = get_model()
+    return run_leaderboard(data.X[:data.n_train], data.y[:data.n_train])
+
+
+@st.cache_resource
+def get_drift_monitor():
+    """Live drift sketches shared by all sessions, updated as candidates are scored."""
+    _, _, _, _, drift_monitor, _ = get_model()
+    return drift_monitor.new_window()
+
+
+@st.cache_resource
+def get_inference_pool():
+    """Worker processes that score uploads off the script thread, shared by all sessions."""
+    model, _, features, _, _, _ = get_model()
+    return InferencePool(model, features)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+
+# ================== COMPACT DATASET ==================
+class CompactDataset:
+    """Cleaned training catalog held as one float32 feature block + uint8 labels.
+
+    Rows are stored in split order (train rows first, then test rows), so the
+    train/test views are plain slices of the same block. ``row_ids`` keeps the
+    original row labels and ``train_idx`` / ``test_idx`` expose the split.
+    """
+
+    def __init__(self, X, y, row_ids, n_train, features, target, classes):
+        # Column-major float32: every feature is one contiguous column,
+        # which is exactly the block layout pandas uses internally.
+        self.X = np.asfortranarray(X, dtype=np.float32)
+        self.y = np.ascontiguousarray(y, dtype=np.uint8)
+        self.row_ids = np.ascontiguousarray(row_ids, dtype=np.int64)
+        self.n_train = int(n_train)
+        self.features = list(features)
+        self.target = target
+        self.classes = np.asarray(classes)
+
+    @classmethod
+    def from_frame(cls, df, features, target, classes, test_size=0.2, random_state=42):
+        """Build from a cleaned, label-encoded frame using the usual split."""
+        train_pos, test_pos = train_test_split(
+            np.arange(len(df)), test_size=test_size, random_state=random_state
+        )
+        order = np.concatenate([train_pos, test_pos])
+        return cls(
+            X=df[features].to_numpy(dtype=np.float32)[order],
+            y=df[target].to_numpy()[order],
+            row_ids=df.index.to_numpy()[order],
+            n_train=len(train_pos),
+            features=features,
+            target=target,
+            classes=classes,
+        )
+
+    def __len__(self):
+        return len(self.y)
+
+    @property
+    def train_idx(self):
+        return self.row_ids[:self.n_train]
+
+    @property
+    def test_idx(self):
+        return self.row_ids[self.n_train:]
+
+    @property
+    def nbytes(self):
+        return self.X.nbytes + self.y.nbytes + self.row_ids.nbytes
+
+    # ----------------- VIEWS -----------------
+    def _frame(self, rows, with_target=True):
+        cols = {feat: self.X[rows, j] for j, feat in enumerate(self.features)}
+        if with_target:
+            cols[self.target] = self.y[rows]
+        index = pd.Index(self.row_ids[rows], copy=False)
+        return pd.DataFrame(cols, index=index, copy=False)
+
+    def frame(self):
+        """Zero-copy DataFrame of features + encoded target."""
+        return self._frame(slice(None))
+
+    def train(self):
+        """Zero-copy (X_train, y_train) views."""
+        rows = slice(None, self.n_train)
+        return self._frame(rows, with_target=False), self.labels(rows)
+
+    def test(self):
+        """Zero-copy (X_test, y_test) views."""
+        rows = slice(self.n_train, None)
+        return self._frame(rows, with_target=False), self.labels(rows)
+
+    def labels(self, rows=slice(None)):
+        """Encoded target as a Series view."""
+        index = pd.Index(self.row_ids[rows], copy=False)
+        return pd.Series(self.y[rows], index=index, name=self.target, copy=False)
+
+    def class_counts(self):
+        """Number of rows per class name."""
+        counts = np.bincount(self.y, minlength=len(self.classes))
+        return pd.Series(counts, index=self.classes.astype(str), name="count")
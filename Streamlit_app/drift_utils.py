@@ -0,0 +1,165 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# ================== CONFIG ==================
+N_BINS = 20
+PSI_EPS = 1e-4
+# Usual PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate, > 0.25 major shift
+PSI_LEVELS = [(0.1, "stable"), (0.25, "moderate")]
+# Below this many non-null live values PSI mostly measures sampling noise
+MIN_PSI_SAMPLES = 5 * N_BINS
+
+
+# ================== FEATURE SKETCH ==================
+class FeatureSketch:
+    """Fixed-size histogram of one feature: bin counts, null count, min/max.
+
+    Non-finite values (NaN and +/-inf, as read_csv parses "inf" cells) are
+    counted as nulls, so they never reach the bins or the min/max bounds.
+
+    Bins are fixed at training time (training quantiles), so updating is a
+    searchsorted + bincount and memory does not grow with the data.
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.n_null = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        nulls = ~np.isfinite(values)
+        self.n_null += int(nulls.sum())
+        values = values[~nulls]
+        if len(values):
+            bins = np.searchsorted(self.edges, values, side="right")
+            self.counts += np.bincount(bins, minlength=len(self.counts))
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.n_null += other.n_null
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def empty(self):
+        return FeatureSketch(self.edges)
+
+    @property
+    def n(self):
+        return int(self.counts.sum()) + self.n_null
+
+    @property
+    def null_rate(self):
+        return self.n_null / self.n if self.n else np.nan
+
+    def proportions(self):
+        total = self.counts.sum()
+        return self.counts / total if total else np.full(len(self.counts), np.nan)
+
+    def quantile(self, q):
+        """Approximate quantile, interpolated linearly inside the bins."""
+        total = self.counts.sum()
+        if not total:
+            return np.nan
+        bounds = np.concatenate([[self.min], self.edges, [self.max]])
+        bounds = np.clip(bounds, self.min, self.max)
+        cum = np.concatenate([[0], np.cumsum(self.counts)]) / total
+        return float(np.interp(q, cum, bounds))
+
+
+# ================== DRIFT MONITOR ==================
+class DriftMonitor:
+    """Training-distribution sketches plus live sketches of scored candidates."""
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.live = {feat: sketch.empty() for feat, sketch in reference.items()}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, features, n_bins=N_BINS):
+        """Build reference sketches from the (uncleaned) training features."""
+        qs = np.linspace(0, 1, n_bins + 1)[1:-1]
+        reference = {}
+        for feat in features:
+            values = df[feat].to_numpy(dtype=np.float64)
+            finite = values[np.isfinite(values)]
+            edges = np.unique(np.quantile(finite, qs)) if len(finite) else []
+            reference[feat] = FeatureSketch(edges)
+            reference[feat].update(values)
+        return cls(reference)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def features(self):
+        return list(self.reference)
+
+    @property
+    def n_live(self):
+        return max((sketch.n for sketch in self.live.values()), default=0)
+
+    def new_window(self):
+        """Monitor with the same reference and empty live sketches."""
+        return DriftMonitor(self.reference)
+
+    def update(self, df):
+        """Add a batch of scored candidates to the live sketches."""
+        with self._lock:
+            for feat, sketch in self.live.items():
+                sketch.update(df[feat].to_numpy(dtype=np.float64))
+
+    def merge(self, other):
+        with self._lock:
+            for feat, sketch in self.live.items():
+                sketch.merge(other.live[feat])
+
+    def report(self):
+        """Per-feature PSI, binned KS statistic and null-rate / median shift."""
+        rows = []
+        with self._lock:
+            for feat, ref in self.reference.items():
+                live = self.live[feat]
+                p_ref, p_live = ref.proportions(), live.proportions()
+                psi = ks = np.nan
+                if live.counts.sum():
+                    a = np.clip(p_ref, PSI_EPS, None)
+                    b = np.clip(p_live, PSI_EPS, None)
+                    psi = float(np.sum((b - a) * np.log(b / a)))
+                    # KS on the binned CDFs (a lower bound on the exact statistic)
+                    ks = float(np.abs(np.cumsum(p_live) - np.cumsum(p_ref)).max())
+                rows.append({
+                    "feature": feat,
+                    "psi": psi,
+                    "ks": ks,
+                    "status": psi_status(psi, int(live.counts.sum())),
+                    "train_median": ref.quantile(0.5),
+                    "live_median": live.quantile(0.5),
+                    "train_null_rate": ref.null_rate,
+                    "live_null_rate": live.null_rate,
+                    "n_live": live.n,
+                })
+        return pd.DataFrame(rows)
+
+
+def psi_status(psi, n_live=None):
+    if np.isnan(psi):
+        return "no data"
+    if n_live is not None and n_live < MIN_PSI_SAMPLES:
+        return "insufficient data"
+    for limit, label in PSI_LEVELS:
+        if psi < limit:
+            return label
+    return "major"
@@ -0,0 +1,267 @@
+import os, time, pickle, threading, itertools
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+from process_utils import start_workers
+
+# ================== CONFIG ==================
+CHUNK_SIZE = 2000
+# Leave a core for the Streamlit server itself; each worker scores single-threaded
+MAX_WORKERS = int(os.environ.get(
+    "INFERENCE_WORKERS", max(1, min(4, (os.cpu_count() or 2) - 1))
+))
+
+
+# ================== WORKER ==================
+_worker = {}
+
+
+def _init_worker(model_bytes, features):
+    model = pickle.loads(model_bytes)
+    if "clf__n_jobs" in model.get_params():
+        model.set_params(clf__n_jobs=1)
+    _worker["model"] = model
+    _worker["features"] = features
+
+
+def _predict_chunk(in_name, out_name, shape, n_classes, start, stop):
+    # Inputs and outputs stay in shared memory; only names and offsets are pickled
+    shm_in, shm_out = SharedMemory(name=in_name), SharedMemory(name=out_name)
+    try:
+        X = np.ndarray(shape, dtype=np.float64, buffer=shm_in.buf)
+        out = np.ndarray((shape[0], n_classes), dtype=np.float64, buffer=shm_out.buf)
+        chunk = pd.DataFrame(X[start:stop], columns=_worker["features"], copy=False)
+        out[start:stop] = _worker["model"].predict_proba(chunk)
+        del X, out, chunk
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+
+# ================== JOB ==================
+class InferenceJob:
+    """One scoring request: shared-memory input/output split into row chunks."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, X, n_classes, chunk_size=CHUNK_SIZE):
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        self.id = next(self._ids)
+        self.shape = X.shape
+        self.n_classes = n_classes
+        self.submitted = time.perf_counter()
+        self.finished = None
+        self.error = None
+        self.cancelled = False
+        self.rows_done = 0
+        self.probas = np.full((len(X), n_classes), np.nan)
+        self._done_rows = np.zeros(len(X), dtype=bool)
+        self._lock = threading.Lock()
+        self._finished_event = threading.Event()
+
+        self._shm_in = SharedMemory(create=True, size=max(X.nbytes, 1))
+        self._shm_out = SharedMemory(create=True, size=max(self.probas.nbytes, 1))
+        np.ndarray(X.shape, dtype=np.float64, buffer=self._shm_in.buf)[:] = X
+
+        self.pending = deque(
+            (start, min(start + chunk_size, len(X))) for start in range(0, len(X), chunk_size)
+        )
+        self.in_flight = 0
+        if not self.pending:
+            self._finish()
+
+    @property
+    def n_rows(self):
+        return self.shape[0]
+
+    @property
+    def progress(self):
+        return self.rows_done / self.n_rows if self.n_rows else 1.0
+
+    @property
+    def latency(self):
+        return (self.finished or time.perf_counter()) - self.submitted
+
+    def done(self):
+        return self._finished_event.is_set()
+
+    def wait(self, timeout=None):
+        return self._finished_event.wait(timeout)
+
+    def partial(self):
+        """(row mask, probabilities) for the rows scored so far."""
+        with self._lock:
+            return self._done_rows.copy(), self.probas[self._done_rows]
+
+    def result(self):
+        """Class probabilities for every row (blocks until the job finishes)."""
+        self.wait()
+        if self.error is not None:
+            raise self.error
+        return self.probas
+
+    def cancel(self):
+        """Drop chunks not yet handed to a worker."""
+        with self._lock:
+            self.cancelled = True
+            self.pending.clear()
+            if not self.in_flight and not self.done():
+                self._finish()
+
+    def _chunk_done(self, start, stop, error):
+        with self._lock:
+            self.in_flight -= 1
+            if error is not None:
+                self.error, self.pending = error, deque()
+            else:
+                out = np.ndarray((self.n_rows, self.n_classes), dtype=np.float64, buffer=self._shm_out.buf)
+                self.probas[start:stop] = out[start:stop]
+                del out
+                self._done_rows[start:stop] = True
+                self.rows_done += stop - start
+            if not self.pending and not self.in_flight:
+                self._finish()
+
+    def _finish(self):
+        self.finished = time.perf_counter()
+        if self.cancelled and self.error is None:
+            self.error = RuntimeError("Inference job cancelled")
+        for shm in (self._shm_in, self._shm_out):
+            shm.close()
+            shm.unlink()
+        self._finished_event.set()
+
+
+# ================== POOL ==================
+class InferencePool:
+    """Process pool shared by all sessions, handing out chunks round-robin per job.
+
+    At most ``max_workers`` chunks are in flight, and jobs take turns, so a
+    large upload cannot starve a small one submitted after it.
+    """
+
+    def __init__(self, model, features, max_workers=MAX_WORKERS, chunk_size=CHUNK_SIZE):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.n_classes = len(model.classes_)
+        self._initargs = (pickle.dumps(model), list(features))
+        self._lock = threading.Lock()
+        self._queue = deque()
+        self._active = set()
+        self._in_flight = 0
+        self._latencies = deque(maxlen=200)
+        self._jobs_done = 0
+        self._jobs_cancelled = 0
+        self._jobs_failed = 0
+        self._rows_done = 0
+        self._executor = self._start_executor()
+
+    def _start_executor(self):
+        # spawn, not fork: the Streamlit server process is multi-threaded.
+        # Every worker is started (and loads the model) now, not on the first upload
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=mp.get_context("spawn"),
+            initializer=_init_worker, initargs=self._initargs,
+        )
+        start_workers(executor, self.max_workers)
+        return executor
+
+    def _replace_broken(self, executor):
+        # A crashed worker breaks the whole executor; later uploads get a fresh one
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = self._start_executor()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, X):
+        """Queue a feature matrix for scoring and return its InferenceJob."""
+        job = InferenceJob(X, self.n_classes, self.chunk_size)
+        with self._lock:
+            self._active.add(job)
+            if job.pending:
+                self._queue.append(job)
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+        # Reserve chunks under the lock, submit outside it: a done-callback
+        # may run synchronously and re-enter _dispatch
+        batch = []
+        with self._lock:
+            executor = self._executor
+            while self._in_flight < self.max_workers and self._queue:
+                job = self._queue.popleft()
+                with job._lock:
+                    if not job.pending:
+                        continue
+                    start, stop = job.pending.popleft()
+                    job.in_flight += 1
+                    if job.pending:
+                        self._queue.append(job)
+                self._in_flight += 1
+                batch.append((job, start, stop))
+
+        for job, start, stop in batch:
+            try:
+                future = executor.submit(
+                    _predict_chunk, job._shm_in.name, job._shm_out.name,
+                    job.shape, job.n_classes, start, stop,
+                )
+            except Exception as exc:  # e.g. BrokenProcessPool after a worker crash
+                future = Future()
+                future.set_exception(exc)
+            future.add_done_callback(
+                lambda f, job=job, start=start, stop=stop: self._on_done(job, start, stop, executor, f)
+            )
+
+    def _on_done(self, job, start, stop, executor, future):
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._replace_broken(executor)
+        job._chunk_done(start, stop, error)
+        with self._lock:
+            self._in_flight -= 1
+            self._collect()
+        self._dispatch()
+
+    def _collect(self):
+        # Caller holds self._lock. Cancelled jobs can finish without a chunk
+        # callback, so finished jobs are swept here rather than counted on the fly
+        for job in [job for job in self._active if job.done()]:
+            self._active.discard(job)
+            if job.error is None:
+                self._latencies.append(job.latency)
+                self._jobs_done += 1
+                self._rows_done += job.rows_done
+            elif job.cancelled:
+                self._jobs_cancelled += 1
+            else:
+                self._jobs_failed += 1
+
+    def metrics(self):
+        """Queue depth, activity and job latency percentiles."""
+        with self._lock:
+            self._collect()
+            queued_jobs = list(self._queue)
+            latencies = np.array(self._latencies)
+            return {
+                "workers": self.max_workers,
+                "chunks_in_flight": self._in_flight,
+                "queued_jobs": len(queued_jobs),
+                "queued_chunks": sum(len(job.pending) for job in queued_jobs),
+                "jobs_completed": self._jobs_done,
+                "jobs_cancelled": self._jobs_cancelled,
+                "jobs_failed": self._jobs_failed,
+                "rows_scored": self._rows_done,
+                "latency_p50_s": float(np.percentile(latencies, 50)) if len(latencies) else np.nan,
+                "latency_p95_s": float(np.percentile(latencies, 95)) if len(latencies) else np.nan,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
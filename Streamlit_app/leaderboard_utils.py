@@ -0,0 +1,184 @@
+import os, json, time, hashlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, f1_score, roc_auc_score
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import (
+    RandomForestClassifier, ExtraTreesClassifier,
+    GradientBoostingClassifier, HistGradientBoostingClassifier
+)
+from imblearn.pipeline import Pipeline
+from imblearn.over_sampling import SMOTE
+from imblearn.under_sampling import RandomUnderSampler
+from xgboost import XGBClassifier
+from process_utils import start_workers
+from pipeline_utils import package_versions
+from model_utils import XGB_PARAM_GRID, TRAINING_PACKAGES
+
+# ================== CONFIG ==================
+CACHE_DIR = ".leaderboard_cache"
+# Leave a core for the Streamlit server itself; each worker fits one fold at a time
+MAX_WORKERS = int(os.environ.get("LEADERBOARD_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+# Every worker process fits one fold at a time, so estimators stay single-threaded
+CANDIDATES = {
+    # Same hyperparameters as the deployed model (first value of each grid entry)
+    "XGBoost": XGBClassifier(
+        random_state=42, eval_metric="logloss", n_jobs=1,
+        **{name.removeprefix("clf__"): values[0] for name, values in XGB_PARAM_GRID.items()}
+    ),
+    "Random Forest": RandomForestClassifier(n_estimators=300, random_state=42, n_jobs=1),
+    "Extra Trees": ExtraTreesClassifier(n_estimators=300, random_state=42, n_jobs=1),
+    "Gradient Boosting": GradientBoostingClassifier(random_state=42),
+    "Hist Gradient Boosting": HistGradientBoostingClassifier(random_state=42),
+    "Decision Tree": DecisionTreeClassifier(random_state=42),
+    "Logistic Regression": LogisticRegression(max_iter=1000),
+    "KNN": KNeighborsClassifier(n_neighbors=15),
+}
+
+RESAMPLERS = {
+    "None": None,
+    "SMOTE": SMOTE(random_state=42),
+    "Undersample": RandomUnderSampler(random_state=42),
+}
+
+
+# ================== KEYS ==================
+def _digest(*parts):
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+    return h.hexdigest()[:16]
+
+
+def config_key(estimator, resampling=None, scale=True):
+    """Stable hash of an estimator / resampler / scaling configuration."""
+    def describe(obj):
+        if obj is None:
+            return None
+        params = {k: repr(v) for k, v in sorted(obj.get_params(deep=True).items())}
+        return [type(obj).__name__, params]
+    return _digest(json.dumps([describe(estimator), describe(resampling), scale]))
+
+
+def data_key(X, y, n_splits, random_state):
+    """Hash of the training data, the fold layout and the library versions."""
+    X = np.ascontiguousarray(X)
+    y = np.ascontiguousarray(y)
+    return _digest(X.dtype.str, X.shape, X.tobytes(), y.dtype.str, y.tobytes(),
+                   n_splits, random_state, package_versions(TRAINING_PACKAGES))
+
+
+# ================== FOLD WORKER ==================
+_worker_data = {}
+
+
+def _init_worker(X, y):
+    # Ship the training arrays once per worker, not once per fold
+    _worker_data["X"] = X
+    _worker_data["y"] = y
+
+
+def build_pipeline(estimator, resampling=None, scale=True):
+    """Same layout as the notebook's run_model: scale -> resample -> clf."""
+    steps = []
+    if scale:
+        steps.append(("ssc", StandardScaler()))
+    if resampling is not None:
+        steps.append(("rsm", clone(resampling)))
+    steps.append(("clf", clone(estimator)))
+    return Pipeline(steps=steps)
+
+
+def _run_fold(estimator, resampling, scale, train_idx, test_idx):
+    X, y = _worker_data["X"], _worker_data["y"]
+    pipe = build_pipeline(estimator, resampling, scale)
+
+    start = time.perf_counter()
+    pipe.fit(X[train_idx], y[train_idx])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = pipe.predict(X[test_idx])
+    y_proba = pipe.predict_proba(X[test_idx])[:, 1]
+    predict_time = time.perf_counter() - start
+
+    y_true = y[test_idx]
+    return {
+        "balanced_accuracy": balanced_accuracy_score(y_true, y_pred),
+        "accuracy": accuracy_score(y_true, y_pred),
+        "f1": f1_score(y_true, y_pred),
+        "roc_auc": roc_auc_score(y_true, y_proba),
+        "fit_time": fit_time,
+        "predict_time": predict_time,
+    }
+
+
+# ================== LEADERBOARD ==================
+def run_leaderboard(X, y, candidates=None, resamplers=None, scale=True,
+                    n_splits=5, random_state=42, n_workers=None, cache_dir=CACHE_DIR):
+    """Cross-validate every candidate x resampler and return a ranked DataFrame.
+
+    Each (config, fold, data) result is stored as JSON under ``cache_dir``;
+    only folds missing from the cache are trained, in a process pool.
+    """
+    candidates = CANDIDATES if candidates is None else candidates
+    resamplers = RESAMPLERS if resamplers is None else resamplers
+    X = np.ascontiguousarray(X)
+    y = np.ascontiguousarray(y)
+
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True,
+                                 random_state=random_state).split(X, y))
+    data_dir = os.path.join(cache_dir, data_key(X, y, n_splits, random_state))
+    os.makedirs(data_dir, exist_ok=True)
+
+    rows, pending = [], []
+    for est_name, estimator in candidates.items():
+        for rsm_name, resampling in resamplers.items():
+            key = config_key(estimator, resampling, scale)
+            for fold, (train_idx, test_idx) in enumerate(folds):
+                meta = {"model": est_name, "resampling": rsm_name, "fold": fold}
+                path = os.path.join(data_dir, f"{key}_fold{fold}.json")
+                if os.path.exists(path):
+                    with open(path) as f:
+                        rows.append({**meta, **json.load(f)})
+                else:
+                    pending.append((meta, path, (estimator, resampling, scale, train_idx, test_idx)))
+
+    if pending:
+        n_workers = min(len(pending), n_workers or MAX_WORKERS)
+        # spawn, not fork: the Streamlit server process is multi-threaded
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(X, y)) as pool:
+            start_workers(pool, n_workers)
+            futures = {pool.submit(_run_fold, *args): (meta, path) for meta, path, args in pending}
+            for future in as_completed(futures):
+                meta, path = futures[future]
+                result = future.result()
+                # Write then rename, so an interrupted run never leaves a truncated entry
+                with open(path + ".tmp", "w") as f:
+                    json.dump(result, f)
+                os.replace(path + ".tmp", path)
+                rows.append({**meta, **result})
+
+    return summarize(pd.DataFrame(rows))
+
+
+def summarize(fold_results):
+    """Average fold results per (model, resampling), best first."""
+    board = (
+        fold_results.drop(columns="fold")
+        .groupby(["model", "resampling"])
+        .agg(["mean", "std"])
+    )
+    board.columns = [f"{metric}_{stat}" for metric, stat in board.columns]
+    board = board.sort_values("balanced_accuracy_mean", ascending=False)
+    return board.reset_index()
@@ -0,0 +1,312 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Launches ``streamlit run app.py`` locally (or targets ``--url``), then drives
+N headless sessions at a time over the app's websocket protocol through the
+scripted FLOWS below. Reports throughput, p50/p95/p99 rerun latency and
+server memory for each concurrency level.
+
+    python load_test.py --concurrency 1 4 8 16 --iterations 3
+"""
+import os, sys, glob, time, uuid, socket, asyncio, argparse, subprocess
+
+import numpy as np
+import pandas as pd
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.proto.Common_pb2 import UploadedFileInfo
+from streamlit.proto.Selectbox_pb2 import Selectbox
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# ================== CONFIG ==================
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_CSV = os.path.join(APP_DIR, "exoplanets data_set 2.csv")
+PAGE_SELECT = "📂 Select a page:"
+
+# Each step is one user interaction = one script rerun
+FLOWS = {
+    "prediction_upload": [
+        ("select", PAGE_SELECT, "Prediction"),
+        ("select", "Select how to provide data:", "Upload CSV"),
+        ("upload", "Upload a CSV file with candidate data", None),
+        ("button", "Predict", None),
+    ],
+    "exploration_sliders": [
+        ("select", PAGE_SELECT, "Data Exploration"),
+        ("slider", "Sample size for scatter matrix:", 300),
+        ("slider", "Sample size for scatter matrix:", 700),
+    ],
+    "model_performance": [
+        ("select", PAGE_SELECT, "Model Performance"),
+    ],
+    "home": [
+        ("select", PAGE_SELECT, "Home"),
+    ],
+}
+
+# Newer Streamlit sends selectbox/radio values as strings, older as indices
+STRING_OPTIONS = "raw_value" in Selectbox.DESCRIPTOR.fields_by_name
+
+
+# ================== SESSION ==================
+class Session:
+    """One headless browser tab: keeps widget state and times each rerun."""
+
+    def __init__(self, base_url, upload_bytes):
+        self.base_url = base_url
+        self.upload_bytes = upload_bytes
+        self.ws = None
+        self.session_id = None
+        self.widgets = {}
+        self.states = {}
+        self.errors = 0
+
+    async def connect(self):
+        url = self.base_url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.ws = await websockets.connect(url, max_size=None)
+        return await self.rerun()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _send(self, msg):
+        await self.ws.send(msg.SerializeToString())
+
+    async def _recv(self):
+        msg = ForwardMsg()
+        msg.ParseFromString(await self.ws.recv())
+        return msg
+
+    async def rerun(self, triggers=()):
+        """Send the current widget state, wait for the script to finish."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(list(self.states.values()) + list(triggers))
+
+        start = time.perf_counter()
+        await self._send(msg)
+        while True:
+            fwd = await self._recv()
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self.session_id = fwd.new_session.initialize.session_id
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._track(fwd.delta.new_element)
+            elif kind == "script_finished":
+                if fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - start
+
+    def _track(self, element):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+        proto = getattr(element, kind, None)
+        if proto is not None and hasattr(proto, "id") and hasattr(proto, "label") and proto.id:
+            self.widgets[proto.label] = (kind, proto)
+
+    # ----------------- INTERACTIONS -----------------
+    async def step(self, action, label, value):
+        start = time.perf_counter()
+        kind, proto = self.widgets[label]
+        state = WidgetState(id=proto.id)
+        if action == "button":
+            state.trigger_value = True
+            await self.rerun(triggers=[state])
+            return time.perf_counter() - start
+        if action == "select":
+            if STRING_OPTIONS:
+                state.string_value = value
+            else:
+                state.int_value = list(proto.options).index(value)
+        elif action == "slider":
+            state.double_array_value.data[:] = [value]
+        elif action == "upload":
+            state.file_uploader_state_value.uploaded_file_info.append(await self._upload())
+        self.states[proto.id] = state
+        await self.rerun()
+        return time.perf_counter() - start
+
+    async def _upload(self):
+        # Ask the server for an upload URL over the websocket, then PUT the file
+        msg = BackMsg()
+        msg.file_urls_request.request_id = uuid.uuid4().hex
+        msg.file_urls_request.session_id = self.session_id
+        msg.file_urls_request.file_names.append("candidates.csv")
+        urls = await self._file_urls(msg)
+        response = await asyncio.to_thread(
+            requests.put, self.base_url + urls.upload_url,
+            files={"file": ("candidates.csv", self.upload_bytes, "text/csv")},
+        )
+        response.raise_for_status()
+        return UploadedFileInfo(
+            name="candidates.csv", size=len(self.upload_bytes),
+            file_id=urls.file_id, file_urls=urls,
+        )
+
+    async def _file_urls(self, msg):
+        await self._send(msg)
+        while True:
+            fwd = await self._recv()
+            if fwd.WhichOneof("type") == "file_urls_response":
+                return fwd.file_urls_response.file_urls[0]
+
+    async def run_flow(self, steps):
+        return [(action, label, await self.step(action, label, value))
+                for action, label, value in steps]
+
+
+# ================== SERVER ==================
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def launch_server(port):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py",
+         "--server.headless", "true",
+         "--server.port", str(port),
+         "--server.enableXsrfProtection", "false",
+         "--browser.gatherUsageStats", "false"],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        try:
+            if requests.get(url + "/_stcore/health", timeout=1).ok:
+                return proc, url
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("❌ Streamlit server did not become healthy")
+
+
+def _proc_tree(pid):
+    """pid and all its descendants, from /proc (Linux, without psutil)."""
+    pids = [pid]
+    for path in glob.glob(f"/proc/{pid}/task/*/children"):
+        try:
+            with open(path) as f:
+                children = [int(child) for child in f.read().split()]
+        except OSError:  # thread or child exited meanwhile
+            continue
+        for child in children:
+            pids += _proc_tree(child)
+    return pids
+
+
+def _proc_rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def server_rss_mb(pid):
+    """Resident memory of the server and its worker processes in MB."""
+    if psutil is not None:
+        proc = psutil.Process(pid)
+        procs = [proc] + proc.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs) / 2**20
+    if not os.path.exists(f"/proc/{pid}"):
+        return np.nan
+    return sum(_proc_rss_kb(p) for p in _proc_tree(pid)) / 1024
+
+
+# ================== LOAD TEST ==================
+async def run_session(url, upload_bytes, flows, iterations):
+    session = Session(url, upload_bytes)
+    results = [("open", "app", await session.connect())]
+    try:
+        for _ in range(iterations):
+            for name, steps in flows.items():
+                results += [(f"{name}:{action}", label, t)
+                            for action, label, t in await session.run_flow(steps)]
+    finally:
+        await session.close()
+    return results, session.errors
+
+
+async def run_level(url, pid, n_sessions, upload_bytes, flows, iterations):
+    peak = [server_rss_mb(pid) if pid else np.nan]
+
+    async def sample_memory():
+        while True:
+            peak[0] = max(peak[0], server_rss_mb(pid))
+            await asyncio.sleep(0.25)
+
+    sampler = asyncio.create_task(sample_memory()) if pid else None
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*[
+        run_session(url, upload_bytes, flows, iterations) for _ in range(n_sessions)
+    ])
+    wall = time.perf_counter() - start
+    if sampler:
+        sampler.cancel()
+
+    latencies = np.array([t for results, _ in outcomes for _, _, t in results])
+    return {
+        "sessions": n_sessions,
+        "reruns": len(latencies),
+        "errors": sum(errors for _, errors in outcomes),
+        "throughput_rps": len(latencies) / wall,
+        "p50_ms": np.percentile(latencies, 50) * 1e3,
+        "p95_ms": np.percentile(latencies, 95) * 1e3,
+        "p99_ms": np.percentile(latencies, 99) * 1e3,
+        "peak_rss_mb": peak[0],
+        "end_rss_mb": server_rss_mb(pid) if pid else np.nan,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--iterations", type=int, default=2,
+                        help="times each session repeats all flows")
+    parser.add_argument("--flows", nargs="+", choices=list(FLOWS), default=list(FLOWS))
+    parser.add_argument("--url", help="target a running server instead of launching one")
+    parser.add_argument("--csv", default=SAMPLE_CSV, help="file uploaded in the prediction flow")
+    parser.add_argument("--rows", type=int, default=200, help="rows of --csv to upload")
+    parser.add_argument("--output", help="write the summary table to this CSV")
+    args = parser.parse_args(argv)
+
+    upload = pd.read_csv(args.csv).head(args.rows).to_csv(index=False).encode("utf-8")
+    flows = {name: FLOWS[name] for name in args.flows}
+
+    proc, url = (None, args.url) if args.url else launch_server(free_port())
+    pid = proc.pid if proc else None
+    try:
+        # Warm-up: trains/caches the model so it is not counted as page latency
+        asyncio.run(run_session(url, upload, flows, 1))
+        rows = []
+        for n in args.concurrency:
+            row = asyncio.run(run_level(url, pid, n, upload, flows, args.iterations))
+            print(f"✅ {n} sessions: p95 {row['p95_ms']:.0f} ms, {row['throughput_rps']:.1f} reruns/s")
+            rows.append(row)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    summary = pd.DataFrame(rows).round(1)
+    print("\n📊 Load Test Summary:\n", summary.to_string(index=False))
+    if args.output:
+        summary.to_csv(args.output, index=False)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,17 @@
 import os, csv
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import classification_report, confusion_matrix
 from xgboost import XGBClassifier
 from imblearn.pipeline import Pipeline
 from joblib import parallel_backend
 import streamlit as st
-
-# ================== CONFIG ==================
-features = [
-    'koi_period', 'koi_duration', 'koi_depth', 'koi_prad',
-    'koi_teq', 'koi_insol', 'koi_steff', 'koi_slogg', 'koi_srad'
-]
-target = "koi_disposition"
+import dataset_utils, drift_utils, similarity_utils
+from dataset_utils import CompactDataset
+from drift_utils import DriftMonitor
+from similarity_utils import NeighborIndex
+from pipeline_utils import Stage, StagePipeline
 
 
 # ================== LOAD DATA ==================
@@ -27,10 +25,63 @@ def load_data(filepath):
     return df
 
 
-# ================== TRAIN MODEL ==================
-@st.cache_data
-def train_model(filepath_1, filepath_2=None):
-    # Load datasets
+XGB_PARAM_GRID = {
+    'clf__n_estimators': [800],
+    "clf__learning_rate": [0.15],
+    'clf__max_depth': [4],
+    "clf__subsample": [1],
+    "clf__colsample_bytree": [1],
+    "clf__min_child_weight": [1],
+    "clf__gamma": [0.2],
+    "clf__reg_alpha": [0],
+    "clf__reg_lambda": [1.0]
+}
+
+# ================== CONFIG ==================
+TRAIN_CONFIG = {
+    "features": [
+        'koi_period', 'koi_duration', 'koi_depth', 'koi_prad',
+        'koi_teq', 'koi_insol', 'koi_steff', 'koi_slogg', 'koi_srad'
+    ],
+    "target": "koi_disposition",
+    "test_size": 0.2,
+    "random_state": 42,
+    "param_grid": XGB_PARAM_GRID,
+    "cv": 5,
+    "scoring": "balanced_accuracy",
+}
+
+# Cached outputs pickled by other versions of these are not reused
+TRAINING_PACKAGES = ["scikit-learn", "xgboost", "imbalanced-learn", "numpy", "pandas"]
+
+
+# ================== MODEL RUNNER ==================
+def run_model(X_train, X_test, y_train, y_test,
+              estimator=None, grid_search=False,
+              grid_params=None, cv=None,
+              scoring="balanced_accuracy"):
+
+    steps = [('clf', estimator)]
+    pipe = Pipeline(steps=steps)
+
+    if grid_search:
+        model = GridSearchCV(
+            pipe, param_grid=grid_params, cv=cv,
+            scoring=scoring, n_jobs=-1
+        )
+    else:
+        model = pipe
+
+    with parallel_backend('threading', n_jobs=-1):
+        model.fit(X_train, y_train)
+
+    y_pred = model.predict(X_test)
+    return model, y_pred
+
+
+# ================== TRAINING STAGES ==================
+def load_stage(filepath_1, filepath_2=None):
+    """Load and concatenate the raw datasets."""
     dataset_1 = load_data(filepath_1)
     if filepath_2:
         dataset_2 = load_data(filepath_2)
@@ -39,83 +90,139 @@ def train_model(filepath_1, filepath_2=None):
         df = dataset_1.copy()
 
     df.reset_index(drop=True, inplace=True)
+    return df
 
+
+def clean_stage(df, features, target):
+    """Filter to labelled KOIs, sketch raw features, median-fill, encode target."""
     # Keep relevant cols
     df = df[features + [target]]
     df = df[df[target].isin(['CONFIRMED', 'FALSE POSITIVE'])]
 
     # Clean missing values
     df = df.dropna(subset=[target])
+
+    # Drift reference: sketch the raw features before the median fill
+    drift_monitor = DriftMonitor.from_frame(df, features)
     df[features] = df[features].fillna(df[features].median())
 
     # Encode target
     le = LabelEncoder()
     df[target] = le.fit_transform(df[target])
+    return df, le, drift_monitor
+
+
+def split_stage(cleaned, features, target, test_size, random_state):
+    """Split into the compact dataset and build the neighbour index."""
+    df, le, _ = cleaned
 
-    # Split
-    X_train, X_test, y_train, y_test = train_test_split(
-        df[features], df[target], test_size=0.2, random_state=42
+    # Split (kept as one compact float32/uint8 block, see dataset_utils)
+    data = CompactDataset.from_frame(
+        df, features, target, le.classes_, test_size=test_size, random_state=random_state
     )
 
-    # ----------------- MODEL RUNNER -----------------
-    def run_model(X_train, X_test, y_train, y_test,
-                  estimator=None, grid_search=False,
-                  grid_params=None, cv=None,
-                  scoring="balanced_accuracy"):
-
-        steps = [('clf', estimator)]
-        pipe = Pipeline(steps=steps)
-
-        if grid_search:
-            model = GridSearchCV(
-                pipe, param_grid=grid_params, cv=cv,
-                scoring=scoring, n_jobs=-1
-            )
-        else:
-            model = pipe
-
-        with parallel_backend('threading', n_jobs=-1):
-            model.fit(X_train, y_train)
-
-        y_pred = model.predict(X_test)
-        return model, y_pred
-
-    # ----------------- TRAINING -----------------
-    params = {
-        'clf__n_estimators': [800],
-        "clf__learning_rate": [0.15],
-        'clf__max_depth': [4],
-        "clf__subsample": [1],
-        "clf__colsample_bytree": [1],
-        "clf__min_child_weight": [1],
-        "clf__gamma": [0.2],
-        "clf__reg_alpha": [0],
-        "clf__reg_lambda": [1.0]
-    }
-
-    model, y_pred = run_model(
+    # Nearest known-KOI lookup, built once and cached with the model
+    neighbor_index = NeighborIndex.from_dataset(data)
+    return data, neighbor_index
+
+
+def train_stage(split, param_grid, cv, scoring):
+    """Grid-search the XGBoost pipeline on the training split."""
+    data, _ = split
+    X_train, y_train = data.train()
+    X_test, y_test = data.test()
+
+    model, _ = run_model(
         X_train, X_test, y_train, y_test,
         estimator=XGBClassifier(
             random_state=42,
             eval_metric="logloss"
         ),
         grid_search=True,
-        grid_params=params,
-        cv=5,
-        scoring="balanced_accuracy"
+        grid_params=param_grid,
+        cv=cv,
+        scoring=scoring
     )
 
     best_model = model.best_estimator_ if hasattr(model, "best_estimator_") else model
+    return best_model, getattr(model, "best_params_", {})
 
-    # ----------------- REPORT -----------------
-    print("\n📊 Best Params:", getattr(model, "best_params_", {}))
-    print("\n📊 Classification Report:\n", classification_report(y_test, y_pred, target_names=le.classes_))
-    print("\n📊 Confusion Matrix:\n", confusion_matrix(y_test, y_pred))
 
-    return best_model, le, features, df, (X_test, y_test)
+def report_stage(split, trained):
+    """Test-set report of the trained model."""
+    data, _ = split
+    best_model, best_params = trained
+    X_test, y_test = data.test()
+    y_pred = best_model.predict(X_test)
+
+    return (
+        f"\n📊 Best Params: {best_params}\n"
+        f"\n📊 Classification Report:\n {classification_report(y_test, y_pred, target_names=data.classes)}\n"
+        f"\n📊 Confusion Matrix:\n {confusion_matrix(y_test, y_pred)}"
+    )
+
+
+TRAINING_PIPELINE = StagePipeline([
+    Stage("load", load_stage, code=[load_data],
+          params=lambda c: {"filepath_1": c["filepath_1"], "filepath_2": c["filepath_2"]},
+          files=lambda c: [path for path in (c["filepath_1"], c["filepath_2"]) if path]),
+    Stage("clean", clean_stage, deps=["load"], code=[drift_utils],
+          params=lambda c: {"features": c["features"], "target": c["target"]}),
+    Stage("split", split_stage, deps=["clean"], code=[dataset_utils, similarity_utils],
+          params=lambda c: {"features": c["features"], "target": c["target"],
+                            "test_size": c["test_size"], "random_state": c["random_state"]}),
+    Stage("train", train_stage, deps=["split"], code=[run_model],
+          params=lambda c: {"param_grid": c["param_grid"], "cv": c["cv"], "scoring": c["scoring"]}),
+    Stage("report", report_stage, deps=["split", "train"]),
+], packages=TRAINING_PACKAGES)
+
+
+# ================== TRAIN MODEL ==================
+@st.cache_data
+def train_model(filepath_1, filepath_2=None):
+    config = {**TRAIN_CONFIG, "filepath_1": filepath_1, "filepath_2": filepath_2}
+    outputs = TRAINING_PIPELINE.run(config, stages=["clean", "split", "train", "report"])
+
+    _, le, drift_monitor = outputs["clean"]
+    data, neighbor_index = outputs["split"]
+    best_model, _ = outputs["train"]
+    print(outputs["report"])
+
+    return best_model, le, config["features"], data, drift_monitor, neighbor_index
 
 
 # ================== GET MODEL WRAPPER ==================
 def get_model():
     """Wrapper to call in Streamlit app. Adjust file paths if needed."""
     return train_model("exoplanets data_Set.csv", "exoplanets data_set 2.csv")
+
+
+# ================== CLI ==================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run or invalidate training pipeline stages.")
+    parser.add_argument("command", choices=["run", "status", "invalidate"])
+    parser.add_argument("stages", nargs="*",
+                        help=f"stages to run / invalidate (default: all of {list(TRAINING_PIPELINE.stages)})")
+    parser.add_argument("--force", action="store_true", help="recompute the given stages even if cached")
+    parser.add_argument("--data", nargs="+", default=["exoplanets data_Set.csv", "exoplanets data_set 2.csv"])
+    args = parser.parse_args()
+    unknown = set(args.stages) - set(TRAINING_PIPELINE.stages)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+    config = {**TRAIN_CONFIG, "filepath_1": args.data[0],
+              "filepath_2": args.data[1] if len(args.data) > 1 else None}
+    stages = args.stages or list(TRAINING_PIPELINE.stages)
+
+    if args.command == "run":
+        outputs = TRAINING_PIPELINE.run(config, stages=stages, force=stages if args.force else ())
+        if "report" in outputs:
+            print(outputs["report"])
+    elif args.command == "invalidate":
+        for path in TRAINING_PIPELINE.invalidate(stages):
+            print(f"🗑️  removed {path}")
+    else:
+        for name, fp, cached in TRAINING_PIPELINE.status(config):
+            print(f"{'♻️ ' if cached else '⚙️ '} {name:<8} {fp}  {'cached' if cached else 'stale'}")
@@ -0,0 +1,134 @@
+import os, glob, inspect, hashlib
+from importlib import metadata
+import joblib
+
+# ================== CONFIG ==================
+CACHE_DIR = ".pipeline_cache"
+
+
+# ================== STAGE ==================
+class Stage:
+    """One memoized training step.
+
+    ``func(*dep_outputs, **params(config))`` is only called when no output
+    is cached for the stage fingerprint: stage name + source of ``func`` and
+    of the helper modules / functions / classes in ``code`` + params +
+    contents of ``files(config)`` + fingerprints of ``deps``.
+    """
+
+    def __init__(self, name, func, deps=(), params=None, files=None, code=()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.params = params or (lambda config: {})
+        self.files = files or (lambda config: [])
+        self.code = list(code)
+
+
+def _file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def package_versions(names):
+    """(distribution, installed version or None) for each name."""
+    return [(name, _package_version(name)) for name in names]
+
+
+# ================== PIPELINE ==================
+class StagePipeline:
+    """Ordered stages with on-disk memoized outputs keyed by input fingerprints.
+
+    The installed versions of ``packages`` are part of every fingerprint, so
+    upgrading e.g. scikit-learn does not reuse outputs pickled by the old one.
+    """
+
+    def __init__(self, stages, cache_dir=CACHE_DIR, packages=()):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = cache_dir
+        self.packages = list(packages)
+
+    def fingerprints(self, config):
+        """Fingerprint of every stage for this config (nothing is run)."""
+        versions = repr(package_versions(self.packages))
+        fps = {}
+        for name, stage in self.stages.items():
+            h = hashlib.sha1(name.encode())
+            h.update(versions.encode())
+            for obj in [stage.func] + stage.code:
+                h.update(inspect.getsource(obj).encode())
+            h.update(repr(sorted(stage.params(config).items())).encode())
+            for path in stage.files(config):
+                h.update(_file_digest(path).encode())
+            for dep in stage.deps:
+                h.update(fps[dep].encode())
+            fps[name] = h.hexdigest()[:16]
+        return fps
+
+    def _path(self, name, fp):
+        return os.path.join(self.cache_dir, f"{name}-{fp}.joblib")
+
+    def run(self, config, stages=None, force=(), verbose=True):
+        """Outputs of ``stages`` (default: all) and whatever they depend on.
+
+        Cached stages are loaded from disk; stages in ``force`` are recomputed.
+        """
+        fps = self.fingerprints(config)
+        outputs = {}
+
+        def get(name):
+            if name in outputs:
+                return outputs[name]
+            stage, path = self.stages[name], self._path(name, fps[name])
+            if name not in force and os.path.exists(path):
+                if verbose:
+                    print(f"♻️  {name}: cached ({fps[name]})")
+                outputs[name] = joblib.load(path)
+            else:
+                args = [get(dep) for dep in stage.deps]
+                if verbose:
+                    print(f"⚙️  {name}: running ({fps[name]})")
+                outputs[name] = stage.func(*args, **stage.params(config))
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Dump then rename: an interrupted or concurrent run never
+                # leaves a truncated file under a valid fingerprint
+                tmp = f"{path}.{os.getpid()}.tmp"
+                joblib.dump(outputs[name], tmp)
+                os.replace(tmp, path)
+            return outputs[name]
+
+        for name in stages or self.stages:
+            get(name)
+        return outputs
+
+    def downstream(self, names):
+        """The given stages plus every stage that depends on them."""
+        selected = set(names)
+        for name, stage in self.stages.items():
+            if selected.intersection(stage.deps):
+                selected.add(name)
+        return [name for name in self.stages if name in selected]
+
+    def invalidate(self, names):
+        """Delete cached outputs of the given stages and their dependents."""
+        removed = []
+        for name in self.downstream(names):
+            for path in glob.glob(os.path.join(self.cache_dir, f"{name}-*.joblib")):
+                os.remove(path)
+                removed.append(path)
+        return removed
+
+    def status(self, config):
+        """(stage, fingerprint, cached?) for every stage."""
+        fps = self.fingerprints(config)
+        return [(name, fp, os.path.exists(self._path(name, fp))) for name, fp in fps.items()]
@@ -0,0 +1,56 @@
+import threading
+from contextlib import contextmanager
+from multiprocessing import spawn
+
+_detached = threading.local()
+
+
+# ================== SPAWNED WORKERS ==================
+def _preparation_data(name):
+    data = _original_preparation_data(name)
+    if getattr(_detached, "active", False):
+        # The child would otherwise re-run the parent's __main__ before any task
+        data.pop("init_main_from_path", None)
+        data.pop("init_main_from_name", None)
+    return data
+
+
+# Only threads inside detached_main() see any difference; re-importing this
+# module wraps the original again rather than the previous wrapper
+_original_preparation_data = getattr(spawn.get_preparation_data, "_original", spawn.get_preparation_data)
+_preparation_data._original = _original_preparation_data
+spawn.get_preparation_data = _preparation_data
+
+
+@contextmanager
+def detached_main():
+    """Spawn worker processes that do not import the parent's ``__main__``.
+
+    ``streamlit run`` installs the app script as ``__main__`` (and re-installs
+    it on every rerun of every session), so spawned children would re-execute
+    the whole app. Inside this block the spawn preparation data for processes
+    started by *this thread* simply leaves ``__main__`` out; ``sys.modules`` is
+    never touched, so concurrent script runs cannot race with it.
+    """
+    previous = getattr(_detached, "active", False)
+    _detached.active = True
+    try:
+        yield
+    finally:
+        _detached.active = previous
+
+
+def _noop():
+    pass
+
+
+def start_workers(executor, n_workers):
+    """Start every worker of a spawn ProcessPoolExecutor up front.
+
+    The executor spawns a process per submit until it has ``max_workers`` and
+    never spawns again afterwards, so all workers are created here, inside
+    detached_main(). A worker that dies breaks the executor instead of being
+    replaced; callers recreate the executor in that case.
+    """
+    with detached_main():
+        return [executor.submit(_noop) for _ in range(n_workers)]
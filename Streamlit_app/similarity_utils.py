@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+
+# ================== NEIGHBOR INDEX ==================
+class NeighborIndex:
+    """KD-tree over the log-scaled, standardized features of known KOIs.
+
+    Built once at training time from the compact dataset, so a query only
+    walks the tree instead of scanning the whole catalog.
+    """
+
+    def __init__(self, X, row_ids, y, leaf_size=40):
+        Z = self._log_scale(X)
+        self.center = Z.mean(axis=0)
+        self.scale = Z.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        Z = (Z - self.center) / self.scale
+        # Missing or infinite query values fall back to the (standardized) training median
+        self.fill = np.median(Z, axis=0)
+        self.tree = KDTree(Z, leaf_size=leaf_size)
+        self.row_ids = row_ids
+        self.y = y
+
+    @classmethod
+    def from_dataset(cls, data, leaf_size=40):
+        return cls(data.X, data.row_ids, data.y, leaf_size=leaf_size)
+
+    @staticmethod
+    def _log_scale(X):
+        # Signed log: period, depth, insolation etc. span several decades
+        X = np.asarray(X, dtype=np.float64)
+        return np.sign(X) * np.log1p(np.abs(X))
+
+    def transform(self, X):
+        Z = (self._log_scale(X) - self.center) / self.scale
+        return np.where(np.isfinite(Z), Z, self.fill)
+
+    def query(self, X, k=5):
+        """Distances and catalog positions of the k nearest known KOIs per row."""
+        k = min(k, len(self.y))
+        return self.tree.query(self.transform(X), k=k)
+
+    def neighbors(self, X, k=5, classes=None):
+        """Long-format table of neighbours: one row per (query, rank)."""
+        dist, pos = self.query(X, k)
+        n_query, k = pos.shape
+        y = self.y[pos.ravel()]
+        return pd.DataFrame({
+            "query": np.repeat(np.arange(n_query), k),
+            "rank": np.tile(np.arange(1, k + 1), n_query),
+            "koi_row": self.row_ids[pos.ravel()],
+            "disposition": np.asarray(classes)[y] if classes is not None else y,
+            "distance": dist.ravel(),
+        })